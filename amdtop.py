@@ -1,660 +1,26 @@
 #!/usr/bin/env python3
-#!/usr/bin/env python3
-"""
-Theme manager for AMDTop
-Handles dark and light themes and custom theme support
 """
-from typing import Dict, Any
-import json
-import os
-
-# Dark theme colors
-DARK_THEME = {
-    "background": "#1f1d2e",
-    "header_background": "#2d2b3a",
-    "widget_background": "#252336",
-    "widget_border": "#3d3b4a",
-    "tab_active": "#4d4b5a",
-    "tab_hover": "#3d3b4a",
-    "text": "#ffffff",
-    "text_muted": "#a9a7b7",
-    "cpu_graph": "#50fa7b",
-    "memory_graph": "#8be9fd",
-    "gpu_graph": "#ff5555",
-    "disk_read": "#bd93f9",
-    "disk_write": "#ff79c6",
-    "network_download": "#50fa7b",
-    "network_upload": "#ffb86c",
-    "temperature": "#ff5555",
-}
-
-# Light theme colors
-LIGHT_THEME = {
-    "background": "#f5f5f7",
-    "header_background": "#e0e0e5",
-    "widget_background": "#ffffff",
-    "widget_border": "#d0d0d5",
-    "tab_active": "#b8b8c0",
-    "tab_hover": "#d0d0d5",
-    "text": "#000000",
-    "text_muted": "#555555",
-    "cpu_graph": "#2ea043",
-    "memory_graph": "#0366d6",
-    "gpu_graph": "#d73a49",
-    "disk_read": "#6f42c1",
-    "disk_write": "#ea4aaa",
-    "network_download": "#2ea043",
-    "network_upload": "#f66a0a",
-    "temperature": "#d73a49",
-}
-
-class ThemeManager:
-    """
-    Manages application themes including custom themes
-    """
-    def __init__(self, config: Dict[str, Any]):
-        """Initialize theme manager with configuration"""
-        self.config = config
-        self.themes = {
-            "dark": DARK_THEME,
-            "light": LIGHT_THEME
-        }
-        
-        # Load custom themes if they exist
-        self._load_custom_themes()
-        
-        # Set current theme from config
-        self.current_theme = config.get("theme", "dark")
-        if self.current_theme not in self.themes:
-            self.current_theme = "dark"
-            
-        self.theme_colors = self._get_theme_colors()
-
-    def _load_custom_themes(self) -> None:
-        """Load custom themes from config directory"""
-        config_dir = os.path.expanduser("~/.config/amdtop/themes")
-        if not os.path.exists(config_dir):
-            return
-            
-        for filename in os.listdir(config_dir):
-            if filename.endswith('.json'):
-                theme_path = os.path.join(config_dir, filename)
-                theme_name = filename[:-5]  # Remove .json
-                try:
-                    with open(theme_path, 'r') as f:
-                        theme_data = json.load(f)
-                        # Validate theme data
-                        if self._validate_theme(theme_data):
-                            self.themes[theme_name] = theme_data
-                except (json.JSONDecodeError, OSError):
-                    print(f"Error loading custom theme: {theme_path}")
-
-    def _validate_theme(self, theme_data: Dict[str, str]) -> bool:
-        """Validate that a theme contains all required colors"""
-        required_colors = set(DARK_THEME.keys())
-        theme_colors = set(theme_data.keys())
-        return required_colors.issubset(theme_colors)
-
-    def _get_theme_colors(self) -> Dict[str, str]:
-        """Get colors for current theme"""
-        return self.themes[self.current_theme]
-
-    def toggle_theme(self) -> None:
-        """Toggle between available themes"""
-        # Get list of available themes
-        theme_names = list(self.themes.keys())
-        # Find current theme index
-        current_index = theme_names.index(self.current_theme)
-        # Get next theme
-        next_index = (current_index + 1) % len(theme_names)
-        self.current_theme = theme_names[next_index]
-        
-        # Update theme colors
-        self.theme_colors = self._get_theme_colors()
-        # Update config
-        self.config["theme"] = self.current_theme
-
-    def get_theme_colors(self) -> Dict[str, str]:
-        """Get current theme colors"""
-        return self.theme_colors
-
-    def get_current_theme(self) -> str:
-        """Get current theme name"""
-        return self.current_theme
-
-    def add_custom_theme(self, name: str, colors: Dict[str, str]) -> bool:
-        """Add a new custom theme"""
-        if not self._validate_theme(colors):
-            return False
-            
-        # Save theme to config directory
-        config_dir = os.path.expanduser("~/.config/amdtop/themes")
-        os.makedirs(config_dir, exist_ok=True)
-        
-        theme_path = os.path.join(config_dir, f"{name}.json")
-        try:
-            with open(theme_path, 'w') as f:
-                json.dump(colors, f, indent=2)
-            self.themes[name] = colors
-            return True
-        except OSError:
-            return False
-
-    def generate_css(self) -> str:
-        """Generate CSS from current theme colors"""
-        colors = self.get_theme_colors()
-        css = f"""
-        .app-grid {{
-            background: {colors['background']};
-            color: {colors['text']};
-        }}
-        
-        Header {{
-            background: {colors['header_background']};
-        }}
-        
-        .widget {{
-            background: {colors['widget_background']};
-            border: 1px solid {colors['widget_border']};
-        }}
-        
-        Tab {{
-            color: {colors['text_muted']};
-        }}
-        
-        Tab:hover {{
-            background: {colors['tab_hover']};
-        }}
-        
-        Tab.-active {{
-            background: {colors['tab_active']};
-            color: {colors['text']};
-        }}
-        
-        #cpu_graph {{
-            color: {colors['cpu_graph']};
-        }}
-        
-        #memory_graph {{
-            color: {colors['memory_graph']};
-        }}
-        
-        #gpu_graph {{
-            color: {colors['gpu_graph']};
-        }}
-        """
-        return css
-
-# Test the module if run directly
-if __name__ == "__main__":
-    config = {"theme": "dark"}
-    theme_manager = ThemeManager(config)
-    
-    # Print current theme colors
-    print("Current theme:", theme_manager.get_current_theme())
-    print("\nTheme colors:")
-    for key, value in theme_manager.get_theme_colors().items():
-        print(f"{key}: {value}")
-    
-    # Test theme toggle
-    print("\nToggling theme...")
-    theme_manager.toggle_theme()
-    print("New theme:", theme_manager.get_current_theme())
-    
-    # Test custom theme
-    print("\nAdding custom theme...")
-    custom_theme = DARK_THEME.copy()
-    custom_theme["background"] = "#000000"
-    success = theme_manager.add_custom_theme("custom", custom_theme)
-    print("Custom theme added:", success)
-    
-    # Print generated CSS
-    print("\nGenerated CSS:")
-    print(theme_manager.generate_css())    #!/usr/bin/env python3
-    """
-    Theme manager for AMDTop
-    Handles dark and light themes and custom theme support
-    """
-    from typing import Dict, Any
-    import json
-    import os
-    
-    # Dark theme colors
-    DARK_THEME = {
-        "background": "#1f1d2e",
-        "header_background": "#2d2b3a",
-        "widget_background": "#252336",
-        "widget_border": "#3d3b4a",
-        "tab_active": "#4d4b5a",
-        "tab_hover": "#3d3b4a",
-        "text": "#ffffff",
-        "text_muted": "#a9a7b7",
-        "cpu_graph": "#50fa7b",
-        "memory_graph": "#8be9fd",
-        "gpu_graph": "#ff5555",
-        "disk_read": "#bd93f9",
-        "disk_write": "#ff79c6",
-        "network_download": "#50fa7b",
-        "network_upload": "#ffb86c",
-        "temperature": "#ff5555",
-    }
-    
-    # Light theme colors
-    LIGHT_THEME = {
-        "background": "#f5f5f7",
-        "header_background": "#e0e0e5",
-        "widget_background": "#ffffff",
-        "widget_border": "#d0d0d5",
-        "tab_active": "#b8b8c0",
-        "tab_hover": "#d0d0d5",
-        "text": "#000000",
-        "text_muted": "#555555",
-        "cpu_graph": "#2ea043",
-        "memory_graph": "#0366d6",
-        "gpu_graph": "#d73a49",
-        "disk_read": "#6f42c1",
-        "disk_write": "#ea4aaa",
-        "network_download": "#2ea043",
-        "network_upload": "#f66a0a",
-        "temperature": "#d73a49",
-    }
-    
-    class ThemeManager:
-        """
-        Manages application themes including custom themes
-        """
-        def __init__(self, config: Dict[str, Any]):
-            """Initialize theme manager with configuration"""
-            self.config = config
-            self.themes = {
-                "dark": DARK_THEME,
-                "light": LIGHT_THEME
-            }
-            
-            # Load custom themes if they exist
-            self._load_custom_themes()
-            
-            # Set current theme from config
-            self.current_theme = config.get("theme", "dark")
-            if self.current_theme not in self.themes:
-                self.current_theme = "dark"
-                
-            self.theme_colors = self._get_theme_colors()
-    
-        def _load_custom_themes(self) -> None:
-            """Load custom themes from config directory"""
-            config_dir = os.path.expanduser("~/.config/amdtop/themes")
-            if not os.path.exists(config_dir):
-                return
-                
-            for filename in os.listdir(config_dir):
-                if filename.endswith('.json'):
-                    theme_path = os.path.join(config_dir, filename)
-                    theme_name = filename[:-5]  # Remove .json
-                    try:
-                        with open(theme_path, 'r') as f:
-                            theme_data = json.load(f)
-                            # Validate theme data
-                            if self._validate_theme(theme_data):
-                                self.themes[theme_name] = theme_data
-                    except (json.JSONDecodeError, OSError):
-                        print(f"Error loading custom theme: {theme_path}")
-    
-        def _validate_theme(self, theme_data: Dict[str, str]) -> bool:
-            """Validate that a theme contains all required colors"""
-            required_colors = set(DARK_THEME.keys())
-            theme_colors = set(theme_data.keys())
-            return required_colors.issubset(theme_colors)
-    
-        def _get_theme_colors(self) -> Dict[str, str]:
-            """Get colors for current theme"""
-            return self.themes[self.current_theme]
-    
-        def toggle_theme(self) -> None:
-            """Toggle between available themes"""
-            # Get list of available themes
-            theme_names = list(self.themes.keys())
-            # Find current theme index
-            current_index = theme_names.index(self.current_theme)
-            # Get next theme
-            next_index = (current_index + 1) % len(theme_names)
-            self.current_theme = theme_names[next_index]
-            
-            # Update theme colors
-            self.theme_colors = self._get_theme_colors()
-            # Update config
-            self.config["theme"] = self.current_theme
-    
-        def get_theme_colors(self) -> Dict[str, str]:
-            """Get current theme colors"""
-            return self.theme_colors
-    
-        def get_current_theme(self) -> str:
-            """Get current theme name"""
-            return self.current_theme
-    
-        def add_custom_theme(self, name: str, colors: Dict[str, str]) -> bool:
-            """Add a new custom theme"""
-            if not self._validate_theme(colors):
-                return False
-                
-            # Save theme to config directory
-            config_dir = os.path.expanduser("~/.config/amdtop/themes")
-            os.makedirs(config_dir, exist_ok=True)
-            
-            theme_path = os.path.join(config_dir, f"{name}.json")
-            try:
-                with open(theme_path, 'w') as f:
-                    json.dump(colors, f, indent=2)
-                self.themes[name] = colors
-                return True
-            except OSError:
-                return False
-    
-        def generate_css(self) -> str:
-            """Generate CSS from current theme colors"""
-            colors = self.get_theme_colors()
-            css = f"""
-            .app-grid {{
-                background: {colors['background']};
-                color: {colors['text']};
-            }}
-            
-            Header {{
-                background: {colors['header_background']};
-            }}
-            
-            .widget {{
-                background: {colors['widget_background']};
-                border: 1px solid {colors['widget_border']};
-            }}
-            
-            Tab {{
-                color: {colors['text_muted']};
-            }}
-            
-            Tab:hover {{
-                background: {colors['tab_hover']};
-            }}
-            
-            Tab.-active {{
-                background: {colors['tab_active']};
-                color: {colors['text']};
-            }}
-            
-            #cpu_graph {{
-                color: {colors['cpu_graph']};
-            }}
-            
-            #memory_graph {{
-                color: {colors['memory_graph']};
-            }}
-            
-            #gpu_graph {{
-                color: {colors['gpu_graph']};
-            }}
-            """
-            return css
-    
-    # Test the module if run directly
-    if __name__ == "__main__":
-        config = {"theme": "dark"}
-        theme_manager = ThemeManager(config)
-        
-        # Print current theme colors
-        print("Current theme:", theme_manager.get_current_theme())
-        print("\nTheme colors:")
-        for key, value in theme_manager.get_theme_colors().items():
-            print(f"{key}: {value}")
-        
-        # Test theme toggle
-        print("\nToggling theme...")
-        theme_manager.toggle_theme()
-        print("New theme:", theme_manager.get_current_theme())
-        
-        # Test custom theme
-        print("\nAdding custom theme...")
-        custom_theme = DARK_THEME.copy()
-        custom_theme["background"] = "#000000"
-        success = theme_manager.add_custom_theme("custom", custom_theme)
-        print("Custom theme added:", success)
-        
-        # Print generated CSS
-        print("\nGenerated CSS:")
-        print(theme_manager.generate_css())        #!/usr/bin/env python3
-        """
-        Theme manager for AMDTop
-        Handles dark and light themes and custom theme support
-        """
-        from typing import Dict, Any
-        import json
-        import os
-        
-        # Dark theme colors
-        DARK_THEME = {
-            "background": "#1f1d2e",
-            "header_background": "#2d2b3a",
-            "widget_background": "#252336",
-            "widget_border": "#3d3b4a",
-            "tab_active": "#4d4b5a",
-            "tab_hover": "#3d3b4a",
-            "text": "#ffffff",
-            "text_muted": "#a9a7b7",
-            "cpu_graph": "#50fa7b",
-            "memory_graph": "#8be9fd",
-            "gpu_graph": "#ff5555",
-            "disk_read": "#bd93f9",
-            "disk_write": "#ff79c6",
-            "network_download": "#50fa7b",
-            "network_upload": "#ffb86c",
-            "temperature": "#ff5555",
-        }
-        
-        # Light theme colors
-        LIGHT_THEME = {
-            "background": "#f5f5f7",
-            "header_background": "#e0e0e5",
-            "widget_background": "#ffffff",
-            "widget_border": "#d0d0d5",
-            "tab_active": "#b8b8c0",
-            "tab_hover": "#d0d0d5",
-            "text": "#000000",
-            "text_muted": "#555555",
-            "cpu_graph": "#2ea043",
-            "memory_graph": "#0366d6",
-            "gpu_graph": "#d73a49",
-            "disk_read": "#6f42c1",
-            "disk_write": "#ea4aaa",
-            "network_download": "#2ea043",
-            "network_upload": "#f66a0a",
-            "temperature": "#d73a49",
-        }
-        
-        class ThemeManager:
-            """
-            Manages application themes including custom themes
-            """
-            def __init__(self, config: Dict[str, Any]):
-                """Initialize theme manager with configuration"""
-                self.config = config
-                self.themes = {
-                    "dark": DARK_THEME,
-                    "light": LIGHT_THEME
-                }
-                
-                # Load custom themes if they exist
-                self._load_custom_themes()
-                
-                # Set current theme from config
-                self.current_theme = config.get("theme", "dark")
-                if self.current_theme not in self.themes:
-                    self.current_theme = "dark"
-                    
-                self.theme_colors = self._get_theme_colors()
-        
-            def _load_custom_themes(self) -> None:
-                """Load custom themes from config directory"""
-                config_dir = os.path.expanduser("~/.config/amdtop/themes")
-                if not os.path.exists(config_dir):
-                    return
-                    
-                for filename in os.listdir(config_dir):
-                    if filename.endswith('.json'):
-                        theme_path = os.path.join(config_dir, filename)
-                        theme_name = filename[:-5]  # Remove .json
-                        try:
-                            with open(theme_path, 'r') as f:
-                                theme_data = json.load(f)
-                                # Validate theme data
-                                if self._validate_theme(theme_data):
-                                    self.themes[theme_name] = theme_data
-                        except (json.JSONDecodeError, OSError):
-                            print(f"Error loading custom theme: {theme_path}")
-        
-            def _validate_theme(self, theme_data: Dict[str, str]) -> bool:
-                """Validate that a theme contains all required colors"""
-                required_colors = set(DARK_THEME.keys())
-                theme_colors = set(theme_data.keys())
-                return required_colors.issubset(theme_colors)
-        
-            def _get_theme_colors(self) -> Dict[str, str]:
-                """Get colors for current theme"""
-                return self.themes[self.current_theme]
-        
-            def toggle_theme(self) -> None:
-                """Toggle between available themes"""
-                # Get list of available themes
-                theme_names = list(self.themes.keys())
-                # Find current theme index
-                current_index = theme_names.index(self.current_theme)
-                # Get next theme
-                next_index = (current_index + 1) % len(theme_names)
-                self.current_theme = theme_names[next_index]
-                
-                # Update theme colors
-                self.theme_colors = self._get_theme_colors()
-                # Update config
-                self.config["theme"] = self.current_theme
-        
-            def get_theme_colors(self) -> Dict[str, str]:
-                """Get current theme colors"""
-                return self.theme_colors
-        
-            def get_current_theme(self) -> str:
-                """Get current theme name"""
-                return self.current_theme
-        
-            def add_custom_theme(self, name: str, colors: Dict[str, str]) -> bool:
-                """Add a new custom theme"""
-                if not self._validate_theme(colors):
-                    return False
-                    
-                # Save theme to config directory
-                config_dir = os.path.expanduser("~/.config/amdtop/themes")
-                os.makedirs(config_dir, exist_ok=True)
-                
-                theme_path = os.path.join(config_dir, f"{name}.json")
-                try:
-                    with open(theme_path, 'w') as f:
-                        json.dump(colors, f, indent=2)
-                    self.themes[name] = colors
-                    return True
-                except OSError:
-                    return False
-        
-            def generate_css(self) -> str:
-                """Generate CSS from current theme colors"""
-                colors = self.get_theme_colors()
-                css = f"""
-                .app-grid {{
-                    background: {colors['background']};
-                    color: {colors['text']};
-                }}
-                
-                Header {{
-                    background: {colors['header_background']};
-                }}
-                
-                .widget {{
-                    background: {colors['widget_background']};
-                    border: 1px solid {colors['widget_border']};
-                }}
-                
-                Tab {{
-                    color: {colors['text_muted']};
-                }}
-                
-                Tab:hover {{
-                    background: {colors['tab_hover']};
-                }}
-                
-                Tab.-active {{
-                    background: {colors['tab_active']};
-                    color: {colors['text']};
-                }}
-                
-                #cpu_graph {{
-                    color: {colors['cpu_graph']};
-                }}
-                
-                #memory_graph {{
-                    color: {colors['memory_graph']};
-                }}
-                
-                #gpu_graph {{
-                    color: {colors['gpu_graph']};
-                }}
-                """
-                return css
-        
-        # Test the module if run directly
-        if __name__ == "__main__":
-            config = {"theme": "dark"}
-            theme_manager = ThemeManager(config)
-            
-            # Print current theme colors
-            print("Current theme:", theme_manager.get_current_theme())
-            print("\nTheme colors:")
-            for key, value in theme_manager.get_theme_colors().items():
-                print(f"{key}: {value}")
-            
-            # Test theme toggle
-            print("\nToggling theme...")
-            theme_manager.toggle_theme()
-            print("New theme:", theme_manager.get_current_theme())
-            
-            # Test custom theme
-            print("\nAdding custom theme...")
-            custom_theme = DARK_THEME.copy()
-            custom_theme["background"] = "#000000"
-            success = theme_manager.add_custom_theme("custom", custom_theme)
-            print("Custom theme added:", success)
-            
-            # Print generated CSS
-            print("\nGenerated CSS:")
-            print(theme_manager.generate_css())"""
 AMDTop - Main Application File
 A TUI for monitoring AMD CPU/GPU systems in real-time.
 """
+import asyncio
+import heapq
+import logging
 import sys
 import time
-import threading
-from datetime import datetime
-from io import BytesIO
-
-import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend for better performance
-import matplotlib.pyplot as plt
+from collections import deque
+from dataclasses import dataclass
+from itertools import islice
 
-from PIL import Image
+import psutil
 from rich.table import Table
 from rich.text import Text
 from textual.app import App, ComposeResult
-from textual.containers import Container, Horizontal, Vertical
-from textual.reactive import reactive
-from textual.widgets import Header, Footer, Static, Label, Tabs, Tab, Button
+from textual.containers import Container
+from textual.message import Message
+from textual.widgets import Header, Footer, Static, Tabs, Tab, Button, ContentSwitcher
 
-from config_loader import load_config, create_default_config, save_config
+from config_loader import load_config, create_default_config
 from network_monitor import NetworkProcessMonitor
 from temperature_monitor import TemperatureMonitor
 from theme_manager import ThemeManager
@@ -667,140 +33,334 @@ except ImportError:
     PYAMDGPU_AVAILABLE = False
     print("Warning: pyamdgpu not available. Using mock GPU data.")
 
+# Tab ids, in display order
+TAB_ORDER = ("system", "disk", "network", "temperature")
+
+# Help screen class, imported on first use by _get_help_screen()
+_HelpScreen = None
+
+def _get_help_screen():
+    """Import the help screen module once and return its screen class."""
+    global _HelpScreen
+    if _HelpScreen is None:
+        from help_screen import HelpScreen
+        _HelpScreen = HelpScreen
+    return _HelpScreen
+
+# psutil samplers used on every tick
+_cpu_percent = psutil.cpu_percent
+_vmem = psutil.virtual_memory
+
+class CountersSampler:
+    """Turns the cumulative network and disk counters into per-second rates.
+
+    Both counters are read once per sample and share one timestamp, so every
+    rate in a snapshot covers the same interval.
+    """
+    __slots__ = ("_last", "_last_time")
+
+    def __init__(self):
+        self._last = None
+        self._last_time = 0.0
+
+    def sample(self):
+        """Return (net_recv, net_sent, disk_read, disk_write) in bytes/s."""
+        now = time.monotonic()
+        net = psutil.net_io_counters()
+        disk = psutil.disk_io_counters()
+        counters = (net.bytes_recv if net else 0, net.bytes_sent if net else 0,
+                    disk.read_bytes if disk else 0, disk.write_bytes if disk else 0)
+        elapsed = now - self._last_time
+        if self._last is None or elapsed <= 0:
+            rates = (0.0, 0.0, 0.0, 0.0)
+        else:
+            # Counters can go backwards when a device or NIC disappears
+            rates = tuple(max(cur - prev, 0) / elapsed for cur, prev in zip(counters, self._last))
+        self._last = counters
+        self._last_time = now
+        return rates
+
+@dataclass
+class SystemSnapshot:
+    """System-wide readings taken once per tick and shared by every graph."""
+    __slots__ = ("cpu_percent", "vmem", "net_recv", "net_sent", "disk_read", "disk_write")
+
+    cpu_percent: float
+    vmem: object
+    # Rates in bytes/s
+    net_recv: float
+    net_sent: float
+    disk_read: float
+    disk_write: float
+
+    @classmethod
+    def capture(cls, counters):
+        return cls(_cpu_percent(), _vmem(), *counters.sample())
+
 class GPUInfo:
     """Class to get AMD GPU information using pyamdgpu."""
+    __slots__ = ("gpu", "_readings", "_read_time")
+
+    # Readings younger than this many seconds are reused
+    CACHE_TTL = 0.5
+
     def __init__(self):
         if PYAMDGPU_AVAILABLE:
             self.gpu = pyamdgpu.AMDGPU()
         else:
             self.gpu = None
+        self._readings = (None, None, None)
+        self._read_time = float("-inf")
+
+    @staticmethod
+    def _query(func):
+        try:
+            return func()
+        except Exception:
+            return None
+
+    def snapshot(self):
+        """Return (temperature, usage, memory usage), read together and cached briefly."""
+        if self.gpu is None:
+            return self._readings
+        now = time.monotonic()
+        if now - self._read_time >= self.CACHE_TTL:
+            gpu = self.gpu
+            self._readings = (self._query(gpu.query_temperature),
+                              self._query(gpu.query_usage),
+                              self._query(gpu.query_vram_usage))
+            self._read_time = now
+        return self._readings
 
     def get_temperature(self):
-        if self.gpu:
-            try:
-                return self.gpu.query_temperature()
-            except Exception:
-                return None
-        return None
+        return self.snapshot()[0]
 
     def get_usage(self):
-        if self.gpu:
-            try:
-                return self.gpu.query_usage()
-            except Exception:
-                return None
-        return None
+        return self.snapshot()[1]
 
     def get_memory_usage(self):
-        if self.gpu:
-            try:
-                return self.gpu.query_vram_usage()
-            except Exception:
-                return None
-        return None
+        return self.snapshot()[2]
+
+# Block characters used for sparklines, lowest to highest
+SPARK_BLOCKS = "▁▂▃▄▅▆▇█"
+
+def sparkline(values, width=None):
+    """Render a sequence of numbers as a one-line unicode sparkline.
+
+    If width is given, only the most recent width values are drawn.
+    """
+    if width is not None and len(values) > width:
+        values = list(islice(values, len(values) - width, None))
+    if not values:
+        return ""
+    lo, hi = min(values), max(values)
+    scale = (len(SPARK_BLOCKS) - 1) / max(hi - lo, 1e-9)
+    return "".join(SPARK_BLOCKS[int((v - lo) * scale)] for v in values)
+
+class ThemeChanged(Message):
+    """Posted by the app after the active theme changes."""
 
 class Graph(Static):
-    """A widget to display a matplotlib graph."""
+    """A widget to display a value history as a sparkline.
+
+    data_func is called with the tick's SystemSnapshot and returns the next value.
+    """
+    DEFAULT_CLASSES = "graph"
+    # Theme color used for the line, if the graph follows the theme
+    color_key = None
+
     def __init__(self, title, data_func, color="blue", max_points=60, **kwargs):
         super().__init__(**kwargs)
         self.title = title
         self.data_func = data_func
         self.color = color
         self.max_points = max_points
-        self.data = []
-        self.set_interval(1, self.update_data)
+        self.data = deque(maxlen=max_points)
+        # What the current render was drawn from, to skip identical redraws
+        self._drawn = None
+
+    def update_data(self, snapshot):
+        self.push(self.data_func(snapshot))
 
-    def update_data(self):
-        value = self.data_func()
+    def sample(self, snapshot):
+        """Record a new sample without redrawing."""
+        value = self.data_func(snapshot)
+        if value is not None:
+            self.data.append(value)
+
+    def push(self, value):
+        """Record a new sample and redraw."""
         if value is not None:
             self.data.append(value)
-            if len(self.data) > self.max_points:
-                self.data.pop(0)
         self.update_graph()
 
     def update_graph(self):
-        plt.clf()
-        plt.figure(figsize=(4, 1.5))
-        plt.plot(self.data, color=self.color)
-        plt.title(self.title)
-        plt.tight_layout()
-        buf = BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        img = Image.open(buf)
-        self.update(img)
+        width = self.content_size.width or None
+        drawn = (tuple(self.data), width, self.color)
+        if drawn == self._drawn:
+            return
+        self._drawn = drawn
+        self.update(Text.assemble(self.title, "\n", (sparkline(self.data, width), self.color)))
+
+    def on_resize(self, event):
+        self.update_graph()
+
+    def apply_theme(self, colors):
+        """Recolor the graph in place from the given theme colors."""
+        if self.color_key:
+            self.color = colors.get(self.color_key, self.color)
+            self.update_graph()
 
 class MultiLineGraph(Static):
-    """A widget to display a matplotlib graph with multiple lines."""
-    def __init__(self, title, data_funcs, labels, colors, max_points=60, **kwargs):
+    """A widget to display several value histories, one sparkline per series."""
+    DEFAULT_CLASSES = "graph"
+
+    def __init__(self, title, data_funcs, labels, colors, max_points=60, color_keys=None, **kwargs):
         super().__init__(**kwargs)
         self.title = title
         self.data_funcs = data_funcs
         self.labels = labels
-        self.colors = colors
+        self.series_colors = colors
+        self.color_keys = color_keys
         self.max_points = max_points
-        self.data = [[] for _ in data_funcs]
-        self.set_interval(1, self.update_data)
+        self.data = [deque(maxlen=max_points) for _ in data_funcs]
+        # What the current render was drawn from, to skip identical redraws
+        self._drawn = None
+
+    def update_data(self, snapshot):
+        self.push([func(snapshot) for func in self.data_funcs])
+
+    def sample(self, snapshot):
+        """Record one new sample per series without redrawing."""
+        for series, func in zip(self.data, self.data_funcs):
+            value = func(snapshot)
+            if value is not None:
+                series.append(value)
 
-    def update_data(self):
-        for i, func in enumerate(self.data_funcs):
-            value = func()
+    def push(self, values):
+        """Record one new sample per series and redraw."""
+        for series, value in zip(self.data, values):
             if value is not None:
-                self.data[i].append(value)
-                if len(self.data[i]) > self.max_points:
-                    self.data[i].pop(0)
+                series.append(value)
         self.update_graph()
 
     def update_graph(self):
-        plt.clf()
-        plt.figure(figsize=(4, 1.5))
-        for i, d in enumerate(self.data):
-            plt.plot(d, color=self.colors[i], label=self.labels[i])
-        plt.title(self.title)
-        plt.legend()
-        plt.tight_layout()
-        buf = BytesIO()
-        plt.savefig(buf, format='png')
-        buf.seek(0)
-        img = Image.open(buf)
-        self.update(img)
+        label_width = max(len(label) for label in self.labels)
+        # Sparklines share the row with a padded label
+        width = max(self.content_size.width - label_width - 1, 1) if self.content_size.width else None
+        drawn = (tuple(map(tuple, self.data)), width, tuple(self.series_colors))
+        if drawn == self._drawn:
+            return
+        self._drawn = drawn
+        text = Text(self.title)
+        for label, color, d in zip(self.labels, self.series_colors, self.data):
+            text.append(f"\n{label:<{label_width}} ")
+            text.append(sparkline(d, width), style=color)
+        self.update(text)
+
+    def on_resize(self, event):
+        self.update_graph()
+
+    def apply_theme(self, colors):
+        """Recolor every series in place from the given theme colors."""
+        if self.color_keys:
+            self.series_colors = [colors.get(key, color) for key, color in zip(self.color_keys, self.series_colors)]
+            self.update_graph()
 
 class CPUGraph(Graph):
     """Widget to display CPU usage graph."""
+    color_key = "cpu_graph"
+
     def __init__(self, color="green", max_points=60, **kwargs):
-        import psutil
-        super().__init__("CPU Usage (%)", lambda: psutil.cpu_percent(), color, max_points, **kwargs)
+        super().__init__("CPU Usage (%)", lambda s: s.cpu_percent, color, max_points, **kwargs)
 
 class GPUGraph(Graph):
     """Widget to display GPU temperature graph."""
+    color_key = "gpu_graph"
+
     def __init__(self, gpu_info, color="red", max_points=60, **kwargs):
-        super().__init__("GPU Temp (°C)", gpu_info.get_temperature, color, max_points, **kwargs)
+        super().__init__("GPU Temp (°C)", lambda s: gpu_info.get_temperature(), color, max_points, **kwargs)
 
 class MemoryGraph(Graph):
+    color_key = "memory_graph"
+
     def __init__(self, color="blue", max_points=60, **kwargs):
-        import psutil
-        super().__init__("Memory Usage (%)", lambda: psutil.virtual_memory().percent, color, max_points, **kwargs)
+        super().__init__("Memory Usage (%)", lambda s: s.vmem.percent, color, max_points, **kwargs)
 
 class TemperatureGraph(Graph):
-    def __init__(self, temp_monitor, color="orange", max_points=60, **kwargs):
-        super().__init__("CPU Temp (°C)", temp_monitor.get_cpu_temperature, color, max_points, **kwargs)
+    color_key = "temperature"
+
+    def __init__(self, temp_monitor, color="dark_orange", max_points=60, **kwargs):
+        super().__init__("CPU Temp (°C)", lambda s: temp_monitor.get_cpu_temperature(), color, max_points, **kwargs)
 
 class TopProcesses(Static):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
-        self.set_interval(2, self.update_table)
-
-    def update_table(self):
-        import psutil
-        procs = sorted(psutil.process_iter(['pid', 'name', 'cpu_percent']),
-                       key=lambda p: p.info['cpu_percent'], reverse=True)[:10]
+        self.table = self._new_table()
+        # Process handles and names by pid, kept across refreshes
+        self._procs = {}
+        # Set while a scan is running in a worker thread
+        self._scanning = False
+        # (pid, cpu tenths) of the rows last drawn, to skip identical redraws
+        self._last_fp = None
+
+    @staticmethod
+    def _new_table():
         table = Table(title="Top Processes")
         table.add_column("PID")
         table.add_column("Name")
         table.add_column("CPU %")
-        for p in procs:
-            table.add_row(str(p.info['pid']), p.info['name'], str(p.info['cpu_percent']))
-        self.update(table)
+        return table
+
+    def _sample(self):
+        """Return (cpu_percent, pid, name) for every process we can inspect."""
+        procs = self._procs
+        pids = set(psutil.pids())
+        for pid in procs.keys() - pids:
+            del procs[pid]
+        for pid in pids:
+            cached = procs.get(pid)
+            # is_running() compares create times, so a reused pid gets a
+            # fresh handle instead of the dead process's name and CPU baseline
+            if cached is not None and cached[0].is_running():
+                continue
+            try:
+                proc = psutil.Process(pid)
+                # The first call only primes the CPU time baseline
+                proc.cpu_percent()
+                procs[pid] = (proc, proc.name())
+            except psutil.Error:
+                procs.pop(pid, None)
+
+        samples = []
+        for pid, (proc, name) in procs.items():
+            try:
+                samples.append((proc.cpu_percent(), pid, name))
+            except psutil.Error:
+                continue
+        return samples
+
+    async def update_table(self):
+        # Scanning every process is slow; keep it off the event loop and
+        # never start a second scan while one is still running
+        if self._scanning:
+            return
+        self._scanning = True
+        try:
+            # run_in_executor rather than asyncio.to_thread, which needs 3.9
+            samples = await asyncio.get_running_loop().run_in_executor(None, self._sample)
+        finally:
+            self._scanning = False
+        procs = heapq.nlargest(10, samples)
+        fp = tuple((pid, int(cpu * 10)) for cpu, pid, _ in procs)
+        if fp == self._last_fp:
+            return
+        self._last_fp = fp
+        # Rows only change when the fingerprint does, so a fresh table is cheap
+        self.table = self._new_table()
+        for cpu, pid, name in procs:
+            self.table.add_row(str(pid), name, str(cpu))
+        self.update(self.table)
 
 class ThemeToggleButton(Button):
     def __init__(self, theme_manager, **kwargs):
@@ -808,8 +368,7 @@ class ThemeToggleButton(Button):
         self.theme_manager = theme_manager
 
     def on_click(self):
-        self.theme_manager.toggle_theme()
-        self.app.refresh()
+        self.app.action_toggle_theme()
 
 class AMDTopApp(App):
     CSS_PATH = None
@@ -831,50 +390,205 @@ class AMDTopApp(App):
         self.temp_monitor = TemperatureMonitor()
         self.net_monitor = NetworkProcessMonitor()
         self.current_tab = self.config.get("default_tab", "system")
+        if self.current_tab not in TAB_ORDER:
+            self.current_tab = TAB_ORDER[0]
+
+        # Each group of widgets refreshes on its own timer
+        self._intervals = self.config.get("intervals", {})
+        self._counters = CountersSampler()
+
+        # Set while a theme restyle is queued, so bursts of toggles restyle once
+        self._refresh_pending = False
+
+        # Tabs whose widgets have been created
+        self._built_tabs = set()
+
+        # Widget factories for each tab body, in tab order
+        self._tab_widgets = {tab: getattr(self, f"_{tab}_widgets") for tab in TAB_ORDER}
+
+    def _system_widgets(self):
+        color = self.theme_manager.color
+        return (CPUGraph(color=color("cpu_graph", "green")),
+                MemoryGraph(color=color("memory_graph", "blue")),
+                TopProcesses())
+
+    def _disk_widgets(self):
+        color = self.theme_manager.color
+        return (MultiLineGraph(
+                    "Disk I/O (bytes/s)",
+                    [lambda s: s.disk_read, lambda s: s.disk_write],
+                    ["Read", "Write"],
+                    [color("disk_read", "blue"), color("disk_write", "red")],
+                    color_keys=("disk_read", "disk_write"),
+                ),)
+
+    def _network_widgets(self):
+        color = self.theme_manager.color
+        return (MultiLineGraph(
+                    "Network (bytes/s)",
+                    [lambda s: s.net_recv, lambda s: s.net_sent],
+                    ["Download", "Upload"],
+                    [color("network_download", "green"), color("network_upload", "dark_orange")],
+                    color_keys=("network_download", "network_upload"),
+                ),)
+
+    def _temperature_widgets(self):
+        color = self.theme_manager.color
+        return (TemperatureGraph(self.temp_monitor, color=color("temperature", "dark_orange")),
+                GPUGraph(self.gpu_info, color=color("gpu_graph", "red")))
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Container():
-            with Tabs():
-                yield Tab("System", id="system")
-                yield Tab("Disk", id="disk")
-                yield Tab("Network", id="network")
-                yield Tab("Temperature", id="temperature")
-            with Container(id="main-content"):
-                if self.current_tab == "system":
-                    yield CPUGraph(color=self.theme_manager.theme_colors.get("cpu_graph", "green"))
-                    yield MemoryGraph(color=self.theme_manager.theme_colors.get("memory_graph", "blue"))
-                    yield TopProcesses()
-                elif self.current_tab == "network":
-                    yield MultiLineGraph(
-                        "Network",
-                        [lambda: 0, lambda: 0],  # Placeholder
-                        ["Download", "Upload"],
-                        [self.theme_manager.theme_colors.get("network_download", "green"),
-                         self.theme_manager.theme_colors.get("network_upload", "orange")]
-                    )
-                elif self.current_tab == "temperature":
-                    yield TemperatureGraph(self.temp_monitor, color="orange")
-                    yield GPUGraph(self.gpu_info, color="red")
+            yield Tabs(
+                Tab("System", id="tab_system"),
+                Tab("Disk", id="tab_disk"),
+                Tab("Network", id="tab_network"),
+                Tab("Temperature", id="tab_temperature"),
+                active=f"tab_{self.current_tab}",
+            )
+            # Every tab body is mounted once; switching tabs only changes
+            # which one is shown. Only the first tab is filled in here, the
+            # rest are built the first time they are shown.
+            with ContentSwitcher(id="body", initial=self.current_tab):
+                for tab in self._tab_widgets:
+                    if tab == self.current_tab:
+                        yield Container(*self._tab_widgets[tab](), id=tab)
+                    else:
+                        yield Container(id=tab)
+        self._built_tabs.add(self.current_tab)
         yield ThemeToggleButton(self.theme_manager)
         yield Footer()
 
+    def on_mount(self):
+        # Widgets looked up on every tick or tab switch
+        self._switcher = self.query_one("#body", ContentSwitcher)
+        self._tabs = self.query_one(Tabs)
+        self._tab_contents = {tab: self._switcher.get_child_by_id(tab) for tab in TAB_ORDER}
+        self._tab_graphs = {tab: tuple(container.query(".graph"))
+                            for tab, container in self._tab_contents.items()}
+        self._process_tables = tuple(self.query(TopProcesses))
+
+        intervals = self._intervals
+        self._tick_graphs()
+        self._tick_processes()
+        self.set_interval(intervals.get("graphs", 1.0), self._tick_graphs)
+        self.set_interval(intervals.get("processes", 2.0), self._tick_processes)
+        # sensors is an external command; keep it off the event loop
+        self.temp_monitor.start(intervals.get("temperature", 5.0))
+
+    def on_unmount(self):
+        self.temp_monitor.stop()
+        self.temp_monitor.close()
+
+    def _tick_graphs(self):
+        """Sample and redraw the graphs."""
+        # All graphs keep sampling so their history stays continuous, but
+        # only the visible tab's graphs are redrawn
+        snapshot = SystemSnapshot.capture(self._counters)
+        for tab, graphs in self._tab_graphs.items():
+            visible = tab == self.current_tab
+            for graph in graphs:
+                graph.sample(snapshot)
+                if visible:
+                    graph.update_graph()
+
+    def _tick_processes(self):
+        for table in self._process_tables:
+            self.run_worker(table.update_table(), group="processes")
+
     def action_quit(self):
         self.exit()
 
     def action_toggle_theme(self):
-        self.theme_manager.toggle_theme()
-        self.refresh()
+        if self.theme_manager.toggle_theme():
+            self._schedule_refresh()
+
+    def _schedule_refresh(self):
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.call_later(self._flush_refresh)
+
+    def _flush_refresh(self):
+        self._refresh_pending = False
+        self.post_message(ThemeChanged())
+
+    def on_theme_changed(self, message):
+        # Restyle the themed widgets in place rather than redrawing the screen
+        colors = self.theme_manager.theme_colors
+        for graphs in self._tab_graphs.values():
+            for graph in graphs:
+                graph.apply_theme(colors)
 
     def action_show_help(self):
-        from help_screen import HelpScreen
-        self.push_screen(HelpScreen())
+        # Build the help screen once and keep it installed for later visits
+        if not self.is_screen_installed("help"):
+            self.install_screen(_get_help_screen()(), "help")
+        self.push_screen("help")
 
     def action_switch_tab(self, tab):
+        if tab == self.current_tab or tab not in self._tab_widgets:
+            return
         self.current_tab = tab
-        self.refresh()
+        if tab not in self._built_tabs:
+            self._build_tab(tab)
+        self._switcher.current = tab
+        self._tabs.active = f"tab_{tab}"
+        # Hidden graphs were sampled but not drawn; catch them up
+        for graph in self._tab_graphs[tab]:
+            graph.update_graph()
+
+    def _build_tab(self, tab):
+        """Create a tab's widgets on its first activation."""
+        widgets = self._tab_widgets[tab]()
+        self._tab_contents[tab].mount(*widgets)
+        self._built_tabs.add(tab)
+        self._tab_graphs[tab] = tuple(w for w in widgets if w.has_class("graph"))
+        self._process_tables += tuple(w for w in widgets if isinstance(w, TopProcesses))
+
+    def on_tabs_tab_activated(self, event):
+        self.action_switch_tab(event.tab.id[len("tab_"):])
+
+class _StderrHandler(logging.StreamHandler):
+    """Writes to whatever sys.stderr is when a record is emitted, so records
+    logged while the app runs go through Textual's output capture."""
+
+    @property
+    def stream(self):
+        return sys.stderr
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def _setup_logging():
+    """Give the amdtop logger its own stderr handler at the default level.
+
+    Done before the config is loaded so its messages aren't dropped; records
+    don't propagate, leaving the root logger untouched.
+    """
+    log = logging.getLogger("amdtop")
+    if not log.handlers:
+        handler = _StderrHandler()
+        handler.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+
+def _configure_logging(config):
+    """Apply the log_level from the config to the amdtop logger."""
+    level = getattr(logging, str(config.get("log_level", "INFO")).upper(), logging.INFO)
+    logging.getLogger("amdtop").setLevel(level)
 
 def main():
+    _setup_logging()
+    # Common case: no arguments, so skip building the argument parser
+    if len(sys.argv) == 1:
+        config = load_config()
+        _configure_logging(config)
+        AMDTopApp(config).run()
+        return
+
     import argparse
     parser = argparse.ArgumentParser(description="AMDTop - AMD CPU/GPU monitoring TUI")
     parser.add_argument("-c", "--config", help="Path to config file")
@@ -886,7 +600,8 @@ def main():
         print("Default config created.")
         sys.exit(0)
 
-    config = load_config(args.config) if args.config else load_config()
+    config = load_config(args.config)
+    _configure_logging(config)
     app = AMDTopApp(config)
     app.run()
 
@@ -3,12 +3,21 @@
 Configuration loader for AMDTop
 Handles loading, saving, and validating configuration
 """
+import copy
+import logging
 import os
 import sys
 import yaml
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from pathlib import Path
+
+log = logging.getLogger("amdtop")
+
+# Prefer the libyaml C bindings when PyYAML was built with them
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader
 
 @dataclass
 class ConfigPaths:
@@ -90,6 +99,30 @@ def validate_config(config: Dict[str, Any]) -> Dict[str, str]:
 
     return errors
 
+def _search_paths(config_path: Optional[str] = None) -> Tuple[str, ...]:
+    """Config files to try, in order of precedence"""
+    paths = ConfigPaths()
+    search_paths = (
+        config_path if config_path else None,
+        paths.LOCAL,
+        os.path.expanduser(paths.USER),
+        paths.SYSTEM
+    )
+    return tuple(filter(None, search_paths))
+
+# Parsed config files by path, with the st_mtime_ns they were parsed at
+_CONFIG_CACHE: Dict[str, Tuple[int, Any]] = {}
+
+def _read_config_file(path: str) -> Any:
+    """Parse a YAML config file, reusing the last parse while its mtime is unchanged"""
+    mtime = os.stat(path).st_mtime_ns
+    cached = _CONFIG_CACHE.get(path)
+    if cached is None or cached[0] != mtime:
+        with open(path, 'r') as f:
+            cached = _CONFIG_CACHE[path] = (mtime, yaml.load(f, Loader=_Loader))
+    # Callers merge this into their config, so never hand out the cached copy
+    return copy.deepcopy(cached[1])
+
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     """
     Load configuration from a YAML file with validation
@@ -100,58 +133,51 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
     Returns:
         Validated configuration dictionary
     """
-    paths = ConfigPaths()
-    search_paths = [
-        config_path if config_path else None,
-        paths.LOCAL,
-        os.path.expanduser(paths.USER),
-        paths.SYSTEM
-    ]
-
-    config = DEFAULT_CONFIG.copy()
+    # Deep copy so merging a config file never modifies the defaults
+    config = copy.deepcopy(DEFAULT_CONFIG)
     loaded = False
 
-    for path in filter(None, search_paths):
+    for path in _search_paths(config_path):
         try:
-            with open(path, 'r') as f:
-                loaded_config = yaml.safe_load(f)
-                if loaded_config:
-                    deep_update(config, loaded_config)
-                    print(f"Loaded configuration from {path}")
-                    loaded = True
-                    break
+            loaded_config = _read_config_file(path)
+            if loaded_config:
+                deep_update(config, loaded_config)
+                log.info("Loaded configuration from %s", path)
+                loaded = True
+                break
         except FileNotFoundError:
             continue
         except yaml.YAMLError as e:
-            print(f"YAML error in config file {path}: {e}", file=sys.stderr)
+            log.error("YAML error in config file %s: %s", path, e)
             continue
         except Exception as e:
-            print(f"Error reading config file {path}: {e}", file=sys.stderr)
+            log.error("Error reading config file %s: %s", path, e)
             continue
 
     if not loaded:
-        print("No configuration file found, using defaults")
+        log.info("No configuration file found, using defaults")
 
     # Validate configuration
     errors = validate_config(config)
     if errors:
-        print("Configuration validation errors:", file=sys.stderr)
+        log.warning("Configuration validation errors:")
         for key, error in errors.items():
-            print(f"  {key}: {error}", file=sys.stderr)
+            log.warning("  %s: %s", key, error)
 
     return config
 
 def deep_update(original: Dict, update: Dict) -> Dict:
     """Recursively update a dictionary"""
-    for key, value in update.items():
-        if (
-            key in original 
-            and isinstance(original[key], dict) 
-            and isinstance(value, dict)
-        ):
-            deep_update(original[key], value)
-        else:
-            original[key] = value
+    # Walk nested dicts with an explicit stack instead of recursing
+    stack = [(original, update)]
+    while stack:
+        target, source = stack.pop()
+        for key, value in source.items():
+            current = target.get(key)
+            if isinstance(current, dict) and isinstance(value, dict):
+                stack.append((current, value))
+            else:
+                target[key] = value
     return original
 
 def save_config(config: Dict[str, Any], path: Optional[str] = None) -> bool:
@@ -172,9 +198,9 @@ def save_config(config: Dict[str, Any], path: Optional[str] = None) -> bool:
         # Validate before saving
         errors = validate_config(config)
         if errors:
-            print("Invalid configuration, not saving:", file=sys.stderr)
+            log.error("Invalid configuration, not saving:")
             for key, error in errors.items():
-                print(f"  {key}: {error}", file=sys.stderr)
+                log.error("  %s: %s", key, error)
             return False
 
         # Ensure directory exists
@@ -182,12 +208,12 @@ def save_config(config: Dict[str, Any], path: Optional[str] = None) -> bool:
 
         # Save configuration
         with open(path, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-        print(f"Configuration saved to {path}")
+            yaml.dump(config, f, Dumper=_Dumper, default_flow_style=False, sort_keys=False)
+        log.info("Configuration saved to %s", path)
         return True
 
     except Exception as e:
-        print(f"Error saving configuration to {path}: {e}", file=sys.stderr)
+        log.error("Error saving configuration to %s: %s", path, e)
         return False
 
 def create_default_config(path: str = "./config.yaml") -> bool:
@@ -206,6 +232,7 @@ if __name__ == "__main__":
     parser.add_argument("--path", help="Path to configuration file")
     
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
 
     if args.create:
         create_default_config(args.path if args.path else ConfigPaths.LOCAL)
@@ -217,4 +244,4 @@ if __name__ == "__main__":
     else:
         print("Current configuration:")
         config = load_config(args.path)
-        yaml.dump(config, sys.stdout, default_flow_style=False)
+        yaml.dump(config, sys.stdout, Dumper=_Dumper, default_flow_style=False)
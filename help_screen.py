@@ -3,22 +3,56 @@
 Help screen for AMDTop
 Provides user documentation and keyboard shortcuts
 """
+from textwrap import indent
+
+from rich.text import Text
 from textual.app import ComposeResult
-from textual.containers import Container, Vertical, Horizontal
+from textual.containers import Container, Vertical
 from textual.screen import Screen
-from textual.widgets import Static, Button, Label
+from textual.widgets import Static, Button
+
+# Help text as (title, indented body), prepared once so opening the screen
+# parses no markup
+_HELP_SECTIONS = tuple((title, indent(body, "  ")) for title, body in (
+    ("Keyboard Shortcuts",
+     "• q or Esc: Quit/Close\n"
+     "• t: Toggle Theme (Dark/Light)\n"
+     "• h: Show this Help Screen\n"
+     "• 1-4: Switch Tabs\n"
+     "• r: Reset Graphs\n"
+     "• p: Pause/Resume Updates"),
+    ("Tabs",
+     "1. System: CPU, Memory, and Process usage\n"
+     "2. Disk: Disk I/O and storage information\n"
+     "3. Network: Network usage by process\n"
+     "4. Temperature: System temperature sensors"),
+    ("System Requirements",
+     "• Linux operating system\n"
+     "• Python 3.7+\n"
+     "• lm-sensors package (for temperature monitoring)\n"
+     "• AMD GPU drivers (for GPU monitoring)"),
+    ("Configuration",
+     "Config file location: ~/.config/amdtop/config.yaml\n"
+     "• Customize update intervals\n"
+     "• Change color scheme\n"
+     "• Adjust graph history length\n"
+     "• Set default tab"),
+))
 
 class HelpSection(Static):
-    """A section in the help screen"""
-    def __init__(self, title: str, content: str, **kwargs):
+    """A section in the help screen, drawn as a single widget"""
+    DEFAULT_CLASSES = "help-section"
+    # Lets CSS style the title line
+    COMPONENT_CLASSES = {"help-section--title"}
+
+    def __init__(self, title: str, body: str, **kwargs):
         super().__init__(**kwargs)
-        self.title = title
-        self.content = content
+        self._section_title = title
+        self._section_body = body
 
-    def compose(self) -> ComposeResult:
-        """Create child widgets"""
-        yield Label(f"[b]{self.title}[/b]", classes="help-title")
-        yield Static(self.content, classes="help-content")
+    def render(self) -> Text:
+        title_style = self.get_component_rich_style("help-section--title")
+        return Text.assemble((self._section_title, title_style), "\n", self._section_body)
 
 class HelpScreen(Screen):
     """Help screen showing keyboard shortcuts and usage information"""
@@ -41,13 +75,13 @@ class HelpScreen(Screen):
         padding: 1 2;
     }
     
-    .help-title {
-        color: $accent;
+    .help-section {
         margin: 1 0;
     }
-    
-    .help-content {
-        margin: 0 0 1 2;
+
+    HelpSection > .help-section--title {
+        color: $accent;
+        text-style: bold;
     }
     
     .help-footer {
@@ -60,49 +94,9 @@ class HelpScreen(Screen):
         """Create child widgets"""
         with Container(classes="help-container"):
             with Vertical():
-                yield HelpSection(
-                    "Keyboard Shortcuts",
-                    """
-                    • q or Esc: Quit/Close
-                    • t: Toggle Theme (Dark/Light)
-                    • h: Show this Help Screen
-                    • 1-4: Switch Tabs
-                    • r: Reset Graphs
-                    • p: Pause/Resume Updates
-                    """
-                )
-                
-                yield HelpSection(
-                    "Tabs",
-                    """
-                    1. System: CPU, Memory, and Process usage
-                    2. Disk: Disk I/O and storage information
-                    3. Network: Network usage by process
-                    4. Temperature: System temperature sensors
-                    """
-                )
-                
-                yield HelpSection(
-                    "System Requirements",
-                    """
-                    • Linux operating system
-                    • Python 3.7+
-                    • lm-sensors package (for temperature monitoring)
-                    • AMD GPU drivers (for GPU monitoring)
-                    """
-                )
-                
-                yield HelpSection(
-                    "Configuration",
-                    """
-                    Config file location: ~/.config/amdtop/config.yaml
-                    • Customize update intervals
-                    • Change color scheme
-                    • Adjust graph history length
-                    • Set default tab
-                    """
-                )
-                
+                for title, body in _HELP_SECTIONS:
+                    yield HelpSection(title, body)
+
                 with Container(classes="help-footer"):
                     yield Button("Close", variant="primary", id="close_help")
 
@@ -111,11 +105,6 @@ class HelpScreen(Screen):
         if event.button.id == "close_help":
             self.app.pop_screen()
 
-    def on_key(self, event) -> None:
-        """Handle key press events"""
-        if event.key in {"escape", "q"}:
-            self.app.pop_screen()
-
 # Test the help screen if run directly
 if __name__ == "__main__":
     from textual.app import App
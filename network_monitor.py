@@ -2,127 +2,340 @@
 """
 Network monitoring module for AMDTop
 Tracks per-process network usage
+
+Linux keeps no per-process network byte counters. With bcc and root the
+monitor counts TCP bytes per process through eBPF. Otherwise a process only
+gets a rate when it is alone in its own network namespace (a container,
+say), where the namespace's interface totals are its traffic; processes
+sharing the host namespace are listed with their connections but 0 B/s.
 """
+import heapq
 import os
 import time
 import psutil
-from collections import defaultdict
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
 from typing import Dict, List, Tuple, Optional
 
+# Optional eBPF support for real per-process byte counts (needs root)
+try:
+    from bcc import BPF
+    BCC_AVAILABLE = True
+except ImportError:
+    BCC_AVAILABLE = False
+
+# Counts TCP payload bytes per process: tcp_sendmsg sees every send and
+# tcp_cleanup_rbuf every receive, both in the calling process's context
+_BPF_PROGRAM = """
+#include <net/sock.h>
+
+struct io_t {
+    u64 tx;
+    u64 rx;
+};
+BPF_HASH(bytes_by_pid, u32, struct io_t);
+
+int kprobe__tcp_sendmsg(struct pt_regs *ctx, struct sock *sk, struct msghdr *msg, size_t size) {
+    u32 pid = bpf_get_current_pid_tgid() >> 32;
+    struct io_t zero = {};
+    struct io_t *io = bytes_by_pid.lookup_or_try_init(&pid, &zero);
+    if (io)
+        __sync_fetch_and_add(&io->tx, size);
+    return 0;
+}
+
+int kprobe__tcp_cleanup_rbuf(struct pt_regs *ctx, struct sock *sk, int copied) {
+    if (copied <= 0)
+        return 0;
+    u32 pid = bpf_get_current_pid_tgid() >> 32;
+    struct io_t zero = {};
+    struct io_t *io = bytes_by_pid.lookup_or_try_init(&pid, &zero);
+    if (io)
+        __sync_fetch_and_add(&io->rx, copied);
+    return 0;
+}
+"""
+
+_BYTE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB')
+
+def format_bytes(value: float) -> str:
+    """Format bytes to human readable string"""
+    # Rates are rarely exactly equal between refreshes, so round them into
+    # buckets well below the printed precision before hitting the cache
+    if value < 1024:
+        return _format_bytes_cached(round(value, 1))
+    if value < 1 << 20:
+        return _format_bytes_cached(int(value) & ~63)
+    return _format_bytes_cached(int(value) & ~0x3FF)
+
+@lru_cache(maxsize=2048)
+def _format_bytes_cached(value: float) -> str:
+    # Each unit is 2**10 times the previous one
+    unit = min(max(int(value).bit_length() - 1, 0) // 10, len(_BYTE_UNITS) - 1)
+    return f"{value / (1 << (unit * 10)):.1f} {_BYTE_UNITS[unit]}"
+
 class NetworkProcessMonitor:
     """Monitors network usage per process"""
+    __slots__ = ("process_stats", "previous_stats", "update_interval", "last_update", "_proc_cache",
+                 "conn_scan_interval", "_last_conn_scan", "_bpf", "_bpf_tried", "_bpf_read_time",
+                 "_pid_established", "_conn_details", "_name_cache")
+
     def __init__(self):
         """Initialize network monitor"""
         self.process_stats: Dict[int, Dict] = {}
         self.previous_stats: Dict[int, Tuple[float, float, float]] = {}
         self.update_interval = 1.0  # seconds
-        self.last_update = 0.0
+        self.last_update = float('-inf')
+        # Enumerating connections is much slower than reading IO counters,
+        # so the connection list is refreshed less often
+        self.conn_scan_interval = 2.0  # seconds
+        self._last_conn_scan = float('-inf')
+        # Process handles reused across updates, by pid
+        self._proc_cache: Dict[int, psutil.Process] = {}
+        # Process names by pid as (create_time, name), so a reused pid is
+        # noticed and not reported under the old command name
+        self._name_cache: Dict[int, Tuple[float, str]] = {}
+        # Connection details and established-connection counts by pid,
+        # built once per scan
+        self._conn_details: Dict[int, List[Dict]] = {}
+        self._pid_established: Counter = Counter()
+        # eBPF byte counters, attached on the first update() so that merely
+        # creating a monitor doesn't load probes
+        self._bpf = None
+        self._bpf_tried = False
+        self._bpf_read_time = 0.0
+
+    @staticmethod
+    def _attach_bpf():
+        """Load the byte-counting probes, or return None if eBPF is unavailable"""
+        if not BCC_AVAILABLE:
+            return None
+        try:
+            return BPF(text=_BPF_PROGRAM)
+        except Exception:
+            # Needs root and kernel headers; fall back to namespace totals
+            return None
+
+    def close(self) -> None:
+        """Detach the eBPF probes, if they were attached"""
+        if self._bpf is not None:
+            self._bpf.cleanup()
+            self._bpf = None
+
+    def _get_proc(self, pid: int) -> psutil.Process:
+        """Return a cached Process for pid, replacing it if the pid was reused"""
+        proc = self._proc_cache.get(pid)
+        if proc is None or not proc.is_running():
+            proc = psutil.Process(pid)
+            self._proc_cache[pid] = proc
+        return proc
+
+    def _name_for(self, pid: int, proc: psutil.Process) -> str:
+        """Return the process name, reading it again only if the pid was reused"""
+        create_time = proc.create_time()
+        cached = self._name_cache.get(pid)
+        if cached and cached[0] == create_time:
+            return cached[1]
+        name = proc.name()
+        self._name_cache[pid] = (create_time, name)
+        return name
 
     def update(self) -> None:
         """Update network statistics for all processes"""
-        current_time = time.time()
+        current_time = time.monotonic()
         if current_time - self.last_update < self.update_interval:
             return
 
-        # Clear old process stats
-        self.process_stats.clear()
-        
+        if not self._bpf_tried:
+            self._bpf_tried = True
+            self._bpf = self._attach_bpf()
+            self._bpf_read_time = current_time
+
+        if current_time - self._last_conn_scan >= self.conn_scan_interval:
+            if not self._scan_connections():
+                return
+            self._last_conn_scan = current_time
+
+        # Update byte rates
+        if self._bpf is not None:
+            self._update_bpf_rates(current_time)
+            self._forget_stale()
+            self.last_update = current_time
+            return
+
+        for pid, totals in self._netns_totals().items():
+            self.process_stats[pid].setdefault('bytes_sent_per_sec', 0.0)
+            self.process_stats[pid].setdefault('bytes_recv_per_sec', 0.0)
+            if totals is None:
+                continue
+            bytes_sent, bytes_recv = totals
+
+            # Calculate rates if we have previous data
+            if pid in self.previous_stats:
+                prev_sent, prev_recv, prev_time = self.previous_stats[pid]
+                time_diff = current_time - prev_time
+
+                if time_diff > 0:
+                    send_rate = (bytes_sent - prev_sent) / time_diff
+                    recv_rate = (bytes_recv - prev_recv) / time_diff
+
+                    self.process_stats[pid].update({
+                        'bytes_sent_per_sec': send_rate,
+                        'bytes_recv_per_sec': recv_rate
+                    })
+
+            # Store current values for next update
+            self.previous_stats[pid] = (bytes_sent, bytes_recv, current_time)
+
+        self._forget_stale()
+        self.last_update = current_time
+
+    def _forget_stale(self) -> None:
+        """Drop cached state for processes that no longer have connections"""
+        stale = (self.previous_stats.keys() | self._proc_cache.keys()
+                 | self._name_cache.keys()) - self.process_stats.keys()
+        for pid in stale:
+            self.previous_stats.pop(pid, None)
+            self._proc_cache.pop(pid, None)
+            self._name_cache.pop(pid, None)
+
+    def _netns_totals(self) -> Dict[int, Optional[Tuple[int, int]]]:
+        """Interface byte totals for processes alone in their network namespace
+
+        Processes sharing a namespace with another monitored process, or with
+        us, map to None since the totals can't be attributed to them.
+        """
+        by_netns: Dict[str, List[int]] = {}
+        for pid in self.process_stats:
+            try:
+                netns = os.readlink(f"/proc/{pid}/ns/net")
+            except OSError:
+                netns = None
+            by_netns.setdefault(netns, []).append(pid)
+
+        try:
+            own_netns = os.readlink("/proc/self/ns/net")
+        except OSError:
+            own_netns = None
+
+        totals: Dict[int, Optional[Tuple[int, int]]] = {}
+        for netns, pids in by_netns.items():
+            if netns is None or netns == own_netns or len(pids) > 1:
+                totals.update(dict.fromkeys(pids))
+                continue
+            totals[pids[0]] = self._read_net_dev(pids[0])
+        return totals
+
+    @staticmethod
+    def _read_net_dev(pid: int) -> Optional[Tuple[int, int]]:
+        """Sum (sent, received) bytes over non-loopback interfaces seen by pid"""
+        sent = recv = 0
+        try:
+            with open(f"/proc/{pid}/net/dev", 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            # Two header lines, then "iface: rx_bytes ... tx_bytes ..."
+            for line in data.splitlines()[2:]:
+                iface, _, counters = line.partition(b':')
+                if iface.strip() == b'lo':
+                    continue
+                fields = counters.split()
+                recv += int(fields[0])
+                sent += int(fields[8])
+        except (ValueError, IndexError):
+            return None
+        return sent, recv
+
+    def _update_bpf_rates(self, current_time: float) -> None:
+        """Turn the bytes counted by the eBPF probes since the last read into rates"""
+        table = self._bpf["bytes_by_pid"]
+        counts = {key.value: (io.tx, io.rx) for key, io in table.items()}
+        table.clear()
+
+        time_diff = current_time - self._bpf_read_time
+        self._bpf_read_time = current_time
+        if time_diff <= 0:
+            return
+
+        for pid, stats in self.process_stats.items():
+            bytes_sent, bytes_recv = counts.get(pid, (0, 0))
+            stats['bytes_sent_per_sec'] = bytes_sent / time_diff
+            stats['bytes_recv_per_sec'] = bytes_recv / time_diff
+
+    def _scan_connections(self) -> bool:
+        """Rebuild per-process connection lists; returns False if not permitted"""
         # Get all network connections
         try:
             connections = psutil.net_connections(kind='inet')
         except psutil.AccessDenied:
             print("Warning: Need root privileges for full network monitoring")
-            return
+            return False
 
         # Group connections by PID
+        conn_details: Dict[int, List[Dict]] = {}
+        established: Counter = Counter()
         for conn in connections:
-            if not conn.pid:
+            pid = conn.pid
+            if not pid:
                 continue
-
-            if conn.pid not in self.process_stats:
-                try:
-                    proc = psutil.Process(conn.pid)
-                    self.process_stats[conn.pid] = {
-                        'name': proc.name(),
-                        'connections': [],
-                        'bytes_sent': 0,
-                        'bytes_recv': 0,
-                        'connection_count': 0
-                    }
-                except (psutil.NoSuchProcess, psutil.AccessDenied):
-                    continue
-
-            # Add connection details
-            self.process_stats[conn.pid]['connections'].append({
+            details = conn_details.get(pid)
+            if details is None:
+                details = conn_details[pid] = []
+            details.append({
                 'local_addr': conn.laddr,
                 'remote_addr': conn.raddr if conn.raddr else None,
                 'status': conn.status,
                 'type': conn.type
             })
-            self.process_stats[conn.pid]['connection_count'] += 1
+            if conn.status == psutil.CONN_ESTABLISHED:
+                established[pid] += 1
+        self._conn_details = conn_details
+        self._pid_established = established
 
-        # Update IO statistics
-        for pid in list(self.process_stats.keys()):
+        process_stats = {}
+        for pid in conn_details:
             try:
-                proc = psutil.Process(pid)
-                io_counters = proc.io_counters()
-                bytes_sent = io_counters.write_bytes
-                bytes_recv = io_counters.read_bytes
-                
-                # Calculate rates if we have previous data
-                if pid in self.previous_stats:
-                    prev_sent, prev_recv, prev_time = self.previous_stats[pid]
-                    time_diff = current_time - prev_time
-                    
-                    if time_diff > 0:
-                        send_rate = (bytes_sent - prev_sent) / time_diff
-                        recv_rate = (bytes_recv - prev_recv) / time_diff
-                        
-                        self.process_stats[pid].update({
-                            'bytes_sent_per_sec': send_rate,
-                            'bytes_recv_per_sec': recv_rate
-                        })
-
-                # Store current values for next update
-                self.previous_stats[pid] = (bytes_sent, bytes_recv, current_time)
-                
+                proc = self._get_proc(pid)
+                process_stats[pid] = {
+                    'name': self._name_for(pid, proc),
+                    'bytes_sent': 0,
+                    'bytes_recv': 0,
+                }
             except (psutil.NoSuchProcess, psutil.AccessDenied):
-                self.process_stats.pop(pid, None)
-                self.previous_stats.pop(pid, None)
-
-        self.last_update = current_time
+                continue
+        self.process_stats = process_stats
+        return True
 
     def get_top_processes(self, count: int = 10) -> List[Tuple[int, str, float, float]]:
         """Get top processes by network usage"""
         results = []
         for pid, stats in self.process_stats.items():
             if 'bytes_sent_per_sec' in stats:
-                results.append((
-                    pid,
-                    stats['name'],
-                    stats.get('bytes_sent_per_sec', 0),
-                    stats.get('bytes_recv_per_sec', 0)
-                ))
-        
-        # Sort by total bandwidth (send + receive)
-        results.sort(key=lambda x: x[2] + x[3], reverse=True)
-        return results[:count]
+                sent = stats['bytes_sent_per_sec']
+                recv = stats['bytes_recv_per_sec']
+                results.append((pid, stats['name'], sent, recv, sent + recv))
+
+        # Top processes by total bandwidth (send + receive)
+        return [top[:4] for top in heapq.nlargest(count, results, key=itemgetter(4))]
 
     def get_process_connection_count(self, pid: int) -> int:
         """Get number of connections for a process"""
-        return self.process_stats.get(pid, {}).get('connection_count', 0)
+        return len(self._conn_details.get(pid, ()))
+
+    def get_process_established_count(self, pid: int) -> int:
+        """Get number of established connections for a process"""
+        return self._pid_established.get(pid, 0)
 
     def get_process_connection_details(self, pid: int) -> List[Dict]:
         """Get detailed connection information for a process"""
-        return self.process_stats.get(pid, {}).get('connections', [])
+        return self._conn_details.get(pid, [])
 
     def format_bytes(self, bytes: float) -> str:
         """Format bytes to human readable string"""
-        for unit in ['B', 'KB', 'MB', 'GB']:
-            if bytes < 1024:
-                return f"{bytes:.1f} {unit}"
-            bytes /= 1024
-        return f"{bytes:.1f} TB"
+        return format_bytes(bytes)
 
     def print_network_usage(self) -> None:
         """Print current network usage (for debugging)"""
@@ -147,3 +360,4 @@ if __name__ == "__main__":
         monitor.update()
         monitor.print_network_usage()
         time.sleep(1)
+    monitor.close()
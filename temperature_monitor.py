@@ -1,87 +1,306 @@
 #!/usr/bin/env python3
 """
 Temperature monitoring module for AMDTop
-Uses lm-sensors to get system temperatures
+Reads hwmon sensors from sysfs, falling back to lm-sensors
 """
 from typing import Dict, List, Tuple, Optional
+import json
+import os
 import subprocess
-import re
 import shutil
-from collections import deque
+import threading
+import numpy as np
+
+# Kernel hardware monitoring interface, the same source lm-sensors reads
+HWMON_DIR = "/sys/class/hwmon"
+
+# sensors prints numbers in the user's locale; force "45.000" style output
+_SENSORS_ENV = dict(os.environ, LC_ALL='C')
+
+# (adapter prefix, reading name) of common CPU package sensors
+_CPU_SENSORS = (
+    ('k10temp-', 'Tctl'),          # AMD Ryzen
+    ('coretemp-', 'Package id 0'), # Intel
+    ('zenpower-', 'Tctl'),         # AMD Zen
+)
+
+# Adapter prefixes of common motherboard Super I/O chips
+_MB_PREFIXES = ('it8620-', 'nct6775-')
 
 class TemperatureMonitor:
     """
-    Monitors system temperatures using lm-sensors
+    Monitors system temperatures using hwmon sysfs or lm-sensors
     """
+    __slots__ = ("sensors_available", "temperatures", "max_history", "_sensor_index",
+                 "_history", "_history_lock", "_head", "_filled", "_sensors_path", "_use_json", "_hwmon",
+                 "_cpu_sensor", "_mb_sensor", "_stop", "_thread")
+
     def __init__(self):
         """Initialize temperature monitor"""
-        self.sensors_available = self._check_sensors_available()
-        if not self.sensors_available:
+        # Temperature inputs found in sysfs; read directly instead of
+        # running sensors when there are any
+        self._hwmon = self._discover_hwmon()
+
+        # Resolved once so each update skips the PATH search
+        self._sensors_path = shutil.which('sensors')
+        self.sensors_available = self._sensors_path is not None
+        # Older lm-sensors releases have no JSON output; fall back to -u
+        self._use_json = True
+        if not self._hwmon and not self.sensors_available:
             print("Warning: lm-sensors not found. Temperature monitoring disabled.")
             
+        # (adapter, reading name) of the CPU sensor, once found
+        self._cpu_sensor: Optional[Tuple[str, str]] = None
+        # Same for the motherboard sensor
+        self._mb_sensor: Optional[Tuple[str, str]] = None
+
         # Temperature data storage
         self.temperatures: Dict[str, Dict[str, Tuple[float, Optional[float]]]] = {}
         
-        # History storage (last 60 readings for each sensor)
-        self.history: Dict[str, Dict[str, deque]] = {}
-        
         # Maximum history length
         self.max_history = 60
+
+        # History storage (last 60 readings for each sensor): one ring row
+        # per (adapter, reading name), all sharing a head column. Missing
+        # readings are NaN.
+        self._sensor_index: Dict[Tuple[str, str], int] = {}
+        self._history = np.full((8, self.max_history), np.nan, dtype=np.float32)
+        self._head = 0
+        self._filled = 0
+        # Held while the updater thread writes a column or grows the ring
+        self._history_lock = threading.Lock()
+
+        # Background updater, see start()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
         
         # Update temperatures on init
         self.update()
 
-    def _check_sensors_available(self) -> bool:
-        """Check if lm-sensors is available"""
-        return shutil.which('sensors') is not None
+    def start(self, interval: float) -> None:
+        """Update the readings every interval seconds on a background thread
+
+        Each update rebinds self.temperatures to a new dict, so readers on
+        other threads always see a complete set of readings.
+        """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,),
+                                        name="temperature-monitor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background thread started by start()"""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            self.update()
+
+    @staticmethod
+    def _discover_hwmon() -> List[Tuple[str, List[Tuple[str, int, Optional[float]]]]]:
+        """Find temperature inputs as (adapter, [(label, input fd, max)])
+
+        Input files stay open for the life of the monitor and are re-read
+        with pread; limits don't change, so they are read once here.
+        """
+        chips = []
+        try:
+            entries = sorted(os.listdir(HWMON_DIR))
+        except OSError:
+            return chips
+
+        for entry in entries:
+            path = os.path.join(HWMON_DIR, entry)
+            try:
+                with open(os.path.join(path, 'name')) as f:
+                    name = f.read().strip()
+                files = set(os.listdir(path))
+            except OSError:
+                continue
+
+            inputs = []
+            for filename in sorted(files):
+                if not (filename.startswith('temp') and filename.endswith('_input')):
+                    continue
+                prefix = filename[:-len('_input')]
+                # Same label lm-sensors would show, e.g. "Tctl" or "temp1"
+                label = prefix
+                if f"{prefix}_label" in files:
+                    try:
+                        with open(os.path.join(path, f"{prefix}_label")) as f:
+                            label = f.read().strip() or prefix
+                    except OSError:
+                        pass
+                high = None
+                if f"{prefix}_max" in files:
+                    try:
+                        with open(os.path.join(path, f"{prefix}_max"), 'rb') as f:
+                            high = int(f.read()) / 1000
+                    except (OSError, ValueError):
+                        pass
+                try:
+                    fd = os.open(os.path.join(path, filename), os.O_RDONLY)
+                except OSError:
+                    continue
+                inputs.append((label, fd, high))
+
+            if inputs:
+                # hwmon index keeps two chips of the same driver apart
+                chips.append((f"{name}-{entry}", inputs))
+        return chips
+
+    def close(self) -> None:
+        """Close the hwmon input files"""
+        for _, inputs in self._hwmon:
+            for _, fd, _ in inputs:
+                os.close(fd)
+        self._hwmon = []
+
+    @staticmethod
+    def _read_millidegrees(fd: int) -> float:
+        """Read a hwmon temperature file (millidegrees Celsius)"""
+        return int(os.pread(fd, 16, 0)) / 1000
+
+    def _read_hwmon(self) -> None:
+        """Read every discovered hwmon temperature input"""
+        temperatures = {}
+        for adapter, inputs in self._hwmon:
+            readings = {}
+            for label, fd, high in inputs:
+                try:
+                    temp = self._read_millidegrees(fd)
+                except (OSError, ValueError):
+                    # Some inputs report errors while the device sleeps
+                    continue
+                readings[label] = (temp, high)
+            temperatures[adapter] = readings
+
+        self.temperatures = temperatures
 
     def update(self) -> None:
         """Update temperature readings"""
+        if self._hwmon:
+            self._read_hwmon()
+            self._update_history()
+            return
+
         if not self.sensors_available:
             return
             
+        if self._use_json:
+            try:
+                self._parse_sensors_json(self._run_sensors('-j'))
+                self._update_history()
+                return
+            except (subprocess.CalledProcessError, ValueError):
+                self._use_json = False
+            except (subprocess.SubprocessError, OSError):
+                print("Error running sensors command")
+                return
+
         try:
-            output = subprocess.check_output(['sensors'], 
-                                          text=True, 
-                                          stderr=subprocess.DEVNULL)
-            self._parse_sensors_output(output)
+            self._parse_sensors_raw(self._run_sensors('-u'))
             self._update_history()
-        except subprocess.SubprocessError:
+        except (subprocess.SubprocessError, OSError):
             print("Error running sensors command")
 
-    def _parse_sensors_output(self, output: str) -> None:
-        """Parse the output from sensors command"""
-        current_adapter = None
+    def _run_sensors(self, flag: str) -> str:
+        """Run sensors with the given output flag and return its output"""
+        return subprocess.check_output([self._sensors_path, flag],
+                                       text=True,
+                                       stderr=subprocess.DEVNULL,
+                                       env=_SENSORS_ENV)
+
+    def _parse_sensors_json(self, output: str) -> None:
+        """Parse `sensors -j` output"""
         temperatures = {}
-        
+        for chip, features in json.loads(output).items():
+            readings = {}
+            for name, subfeatures in features.items():
+                # Skip the "Adapter" string and non-temperature features
+                if not isinstance(subfeatures, dict):
+                    continue
+                temp = high = None
+                for key, value in subfeatures.items():
+                    if key.startswith('temp'):
+                        if key.endswith('_input'):
+                            temp = float(value)
+                        elif key.endswith('_max'):
+                            high = float(value)
+                if temp is not None:
+                    readings[name] = (temp, high)
+            temperatures[chip] = readings
+
+        self.temperatures = temperatures
+
+    def _parse_sensors_raw(self, output: str) -> None:
+        """Parse `sensors -u` output"""
+        temperatures = {}
+        readings = None
+        name = None
+
         for line in output.splitlines():
-            # Check for adapter
-            if "Adapter:" in line:
-                current_adapter = line.split(":")[1].strip()
-                temperatures[current_adapter] = {}
+            if not line.strip():
                 continue
-                
-            # Parse temperature readings
-            match = re.match(r'^([^:]+):\s+[+-]?([\d.]+)°C\s+\(high = [+-]?([\d.]+)°C\)?', line)
-            if match and current_adapter:
-                name, temp, high = match.groups()
-                name = name.strip()
-                temp = float(temp)
-                high = float(high) if high else None
-                temperatures[current_adapter][name] = (temp, high)
-        
-        self.temperatures = temperatures
+            if not line[0].isspace():
+                if ':' not in line:
+                    # Chip name, e.g. "k10temp-pci-00c3"
+                    readings = temperatures[line.strip()] = {}
+                elif not line.startswith('Adapter:'):
+                    # Feature label, e.g. "Tctl:"
+                    name = line.rstrip().rstrip(':')
+                continue
+
+            # Subfeature, e.g. "  temp1_input: 45.000"
+            key, _, value = line.strip().partition(': ')
+            if readings is None or name is None or not key.startswith('temp'):
+                continue
+            temp, high = readings.get(name, (None, None))
+            if key.endswith('_input'):
+                temp = float(value)
+            elif key.endswith('_max'):
+                high = float(value)
+            else:
+                continue
+            readings[name] = (temp, high)
+
+        # Drop features that had a limit but no reading
+        self.temperatures = {
+            chip: {name: reading for name, reading in readings.items() if reading[0] is not None}
+            for chip, readings in temperatures.items()
+        }
+
+    def _sensor_row(self, adapter: str, name: str) -> int:
+        """Return the history row for a sensor, growing the ring if needed"""
+        row = self._sensor_index.get((adapter, name))
+        if row is None:
+            row = len(self._sensor_index)
+            rows = len(self._history)
+            if row >= rows:
+                grown = np.full((rows * 2, self.max_history), np.nan, dtype=np.float32)
+                grown[:rows] = self._history
+                self._history = grown
+            # Publish the row only once the ring has room for it
+            self._sensor_index[(adapter, name)] = row
+        return row
 
     def _update_history(self) -> None:
         """Update temperature history"""
-        for adapter, readings in self.temperatures.items():
-            if adapter not in self.history:
-                self.history[adapter] = {}
-                
-            for name, (temp, _) in readings.items():
-                if name not in self.history[adapter]:
-                    self.history[adapter][name] = deque(maxlen=self.max_history)
-                self.history[adapter][name].append(temp)
+        with self._history_lock:
+            head = self._head
+            self._history[:, head] = np.nan
+            for adapter, readings in self.temperatures.items():
+                for name, (temp, _) in readings.items():
+                    row = self._sensor_row(adapter, name)
+                    self._history[row, head] = temp
+            self._head = (head + 1) % self.max_history
+            self._filled = min(self._filled + 1, self.max_history)
 
     def get_all_temperatures(self) -> Dict[str, Dict[str, Tuple[float, Optional[float]]]]:
         """Get all temperature readings"""
@@ -89,37 +308,49 @@ class TemperatureMonitor:
 
     def get_temperature_history(self, sensor_name: str, temp_name: str) -> List[float]:
         """Get temperature history for a specific sensor"""
-        if sensor_name in self.history and temp_name in self.history[sensor_name]:
-            return list(self.history[sensor_name][temp_name])
-        return []
+        # Snapshot under the lock; the updater thread may be mid-column
+        with self._history_lock:
+            row = self._sensor_index.get((sensor_name, temp_name))
+            if row is None:
+                return []
+            ring = self._history[row].copy()
+            head, filled = self._head, self._filled
+        if filled < self.max_history:
+            values = ring[:filled]
+        else:
+            values = np.concatenate((ring[head:], ring[:head]))
+        return values[~np.isnan(values)].tolist()
 
     def get_cpu_temperature(self) -> Optional[float]:
         """Get CPU temperature (tries different common sensor names)"""
-        cpu_sensors = [
-            ('k10temp-*', 'Tctl'),         # AMD Ryzen
-            ('coretemp-*', 'Package id 0'), # Intel
-            ('zenpower-*', 'Tctl'),        # AMD Zen
-        ]
-        
-        for adapter in self.temperatures:
-            for sensor_pattern, temp_name in cpu_sensors:
-                if re.match(sensor_pattern, adapter):
-                    readings = self.temperatures[adapter]
-                    if temp_name in readings:
-                        return readings[temp_name][0]
+        if self._cpu_sensor is not None:
+            adapter, temp_name = self._cpu_sensor
+            reading = self.temperatures.get(adapter, {}).get(temp_name)
+            if reading is not None:
+                return reading[0]
+
+        for adapter, readings in self.temperatures.items():
+            for prefix, temp_name in _CPU_SENSORS:
+                if adapter.startswith(prefix) and temp_name in readings:
+                    self._cpu_sensor = (adapter, temp_name)
+                    return readings[temp_name][0]
         return None
 
     def get_motherboard_temperature(self) -> Optional[float]:
         """Get motherboard temperature"""
-        mb_sensors = ['it8620-*', 'nct6775-*']
-        
-        for adapter in self.temperatures:
-            for sensor_pattern in mb_sensors:
-                if re.match(sensor_pattern, adapter):
-                    # Look for likely motherboard temp sensors
-                    for name, (temp, _) in self.temperatures[adapter].items():
-                        if 'SYSTIN' in name or 'Board' in name:
-                            return temp
+        if self._mb_sensor is not None:
+            adapter, temp_name = self._mb_sensor
+            reading = self.temperatures.get(adapter, {}).get(temp_name)
+            if reading is not None:
+                return reading[0]
+
+        for adapter, readings in self.temperatures.items():
+            if adapter.startswith(_MB_PREFIXES):
+                # Look for likely motherboard temp sensors
+                for name, (temp, _) in readings.items():
+                    if 'SYSTIN' in name or 'Board' in name:
+                        self._mb_sensor = (adapter, name)
+                        return temp
         return None
 
     def print_all_temperatures(self) -> None:
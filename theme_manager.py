@@ -3,9 +3,29 @@
 Theme manager for AMDTop
 Handles dark and light themes and custom theme support
 """
-from typing import Dict, Any
+from operator import itemgetter
+from string import Formatter
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Tuple
 import json
 import os
+import sys
+
+# Use orjson for custom theme files when available
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(data: Dict[str, str]) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(data: Dict[str, str]) -> bytes:
+        return json.dumps(data, indent=2).encode()
+
+# Directory holding user-defined theme files
+_THEMES_DIR = os.path.expanduser("~/.config/amdtop/themes")
 
 # Dark theme colors
 DARK_THEME = {
@@ -47,76 +67,240 @@ LIGHT_THEME = {
     "temperature": "#d73a49",
 }
 
+def _intern_colors(colors: Dict[str, str]) -> Dict[str, str]:
+    """Intern color values so themes sharing a color share one string"""
+    return {
+        key: sys.intern(value) if isinstance(value, str) else value
+        for key, value in colors.items()
+    }
+
+DARK_THEME = _intern_colors(DARK_THEME)
+LIGHT_THEME = _intern_colors(LIGHT_THEME)
+
+# Colors every theme must define
+_REQUIRED_COLORS = frozenset(DARK_THEME)
+
+# Stylesheet template, filled in with the active theme colors
+_CSS_TEMPLATE = """
+.app-grid {{
+    background: {background};
+    color: {text};
+}}
+
+Header {{
+    background: {header_background};
+}}
+
+.widget {{
+    background: {widget_background};
+    border: 1px solid {widget_border};
+}}
+
+Tab {{
+    color: {text_muted};
+}}
+
+Tab:hover {{
+    background: {tab_hover};
+}}
+
+Tab.-active {{
+    background: {tab_active};
+    color: {text};
+}}
+
+#cpu_graph {{
+    color: {cpu_graph};
+}}
+
+#memory_graph {{
+    color: {memory_graph};
+}}
+
+#gpu_graph {{
+    color: {gpu_graph};
+}}
+"""
+
+def _split_template(template: str) -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    """Split a format template into literal fragments and the keys between them"""
+    parts, keys, pending = [], [], []
+    for literal, field, _, _ in Formatter().parse(template):
+        pending.append(literal)
+        if field:
+            parts.append("".join(pending))
+            keys.append(field)
+            pending = []
+    parts.append("".join(pending))
+    return tuple(parts), tuple(keys)
+
+# Literal CSS fragments and the color key that follows each one; the final
+# fragment has no key after it
+_CSS_STATIC_PARTS, _CSS_KEY_ORDER = _split_template(_CSS_TEMPLATE)
+
+# Pulls a theme's stylesheet colors out as a tuple in template order
+_css_colors = itemgetter(*_CSS_KEY_ORDER)
+
+def _render_css(theme: Mapping[str, str]) -> str:
+    """Fill the stylesheet template with a theme's colors"""
+    buf = []
+    append = buf.append
+    for static, color in zip(_CSS_STATIC_PARTS, _css_colors(theme)):
+        append(static)
+        append(color)
+    append(_CSS_STATIC_PARTS[-1])
+    return "".join(buf)
+
+# The built-in themes never change, so their CSS is rendered at import
+_BUILTIN_CSS = {"dark": _render_css(DARK_THEME), "light": _render_css(LIGHT_THEME)}
+
 class ThemeManager:
     """
     Manages application themes including custom themes
     """
+    __slots__ = (
+        "config",
+        "themes",
+        "current_theme",
+        "theme_colors",
+        "_css_cache",
+        "_color_cache",
+        "_custom_loaded",
+        "_custom_paths",
+        "_theme_order",
+        "_theme_idx",
+    )
+
     def __init__(self, config: Dict[str, Any]):
         """Initialize theme manager with configuration"""
         self.config = config
+        # Themes are stored as read-only views so cached CSS can't go stale
         self.themes = {
-            "dark": DARK_THEME,
-            "light": LIGHT_THEME
+            "dark": MappingProxyType(DARK_THEME),
+            "light": MappingProxyType(LIGHT_THEME)
         }
-        
-        # Load custom themes if they exist
-        self._load_custom_themes()
-        
+        # Toggle order, extended as themes are added
+        self._theme_order = list(self.themes)
+
+        # Custom theme files are only listed once they are needed, and each
+        # one is parsed when it is first switched to
+        self._custom_loaded = False
+        self._custom_paths: Dict[str, str] = {}
+
+        # Generated CSS per theme name, kept across toggles
+        self._css_cache: Dict[str, str] = dict(_BUILTIN_CSS)
+        # Colors looked up through color(), cleared when the theme changes
+        self._color_cache: Dict[Tuple[str, str], str] = {}
+
         # Set current theme from config
         self.current_theme = config.get("theme", "dark")
-        if self.current_theme not in self.themes:
-            self.current_theme = "dark"
-            
+        # A file in the themes directory may also override a built-in theme
+        if (self.current_theme not in self.themes
+                or os.path.exists(os.path.join(_THEMES_DIR, f"{self.current_theme}.json"))):
+            self._ensure_custom_loaded()
+            if not self._load_theme(self.current_theme):
+                self.current_theme = "dark"
+        self._theme_idx = self._theme_order.index(self.current_theme)
+
         self.theme_colors = self._get_theme_colors()
 
+    def _ensure_custom_loaded(self) -> None:
+        """Load custom themes on first use"""
+        if not self._custom_loaded:
+            self._load_custom_themes()
+            self._custom_loaded = True
+
     def _load_custom_themes(self) -> None:
-        """Load custom themes from config directory"""
-        config_dir = os.path.expanduser("~/.config/amdtop/themes")
-        if not os.path.exists(config_dir):
+        """List custom theme files in the config directory"""
+        try:
+            entries = os.scandir(_THEMES_DIR)
+        except FileNotFoundError:
             return
-            
-        for filename in os.listdir(config_dir):
-            if filename.endswith('.json'):
-                theme_path = os.path.join(config_dir, filename)
-                theme_name = filename[:-5]  # Remove .json
-                try:
-                    with open(theme_path, 'r') as f:
-                        theme_data = json.load(f)
-                        # Validate theme data
-                        if self._validate_theme(theme_data):
-                            self.themes[theme_name] = theme_data
-                except (json.JSONDecodeError, OSError):
-                    print(f"Error loading custom theme: {theme_path}")
+
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith('.json') or not entry.is_file():
+                    continue
+                theme_name = entry.name[:-5]  # Remove .json
+                # dark.json and light.json override the built-in themes
+                self._custom_paths[theme_name] = entry.path
+                if theme_name not in self._theme_order:
+                    self._theme_order.append(theme_name)
+
+    def _load_theme(self, name: str) -> bool:
+        """Make sure a theme is loaded, parsing its file if needed"""
+        path = self._custom_paths.pop(name, None)
+        if path is None:
+            return name in self.themes
+        try:
+            with open(path, 'rb') as f:
+                theme_data = _json_loads(f.read())
+            if not isinstance(theme_data, dict):
+                raise ValueError("theme file must contain a JSON object")
+        except (ValueError, UnicodeDecodeError, OSError):
+            print(f"Error loading custom theme: {path}")
+            # A broken override still leaves the built-in theme usable
+            return name in self.themes
+        # Validate theme data
+        if not self._validate_theme(theme_data):
+            return name in self.themes
+        self._register_theme(name, theme_data)
+        return True
+
+    def _register_theme(self, name: str, colors: Dict[str, str]) -> None:
+        """Store a theme and add it to the toggle order"""
+        if name not in self._theme_order:
+            self._theme_order.append(name)
+        self._custom_paths.pop(name, None)
+        self.themes[name] = MappingProxyType(_intern_colors(colors))
+        # Drop CSS rendered from the colors this theme replaces
+        self._css_cache.pop(name, None)
 
     def _validate_theme(self, theme_data: Dict[str, str]) -> bool:
         """Validate that a theme contains all required colors"""
-        required_colors = set(DARK_THEME.keys())
-        theme_colors = set(theme_data.keys())
-        return required_colors.issubset(theme_colors)
+        if len(theme_data) < len(_REQUIRED_COLORS):
+            return False
+        return _REQUIRED_COLORS.issubset(theme_data)
 
-    def _get_theme_colors(self) -> Dict[str, str]:
+    def _get_theme_colors(self) -> Mapping[str, str]:
         """Get colors for current theme"""
         return self.themes[self.current_theme]
 
-    def toggle_theme(self) -> None:
-        """Toggle between available themes"""
-        # Get list of available themes
-        theme_names = list(self.themes.keys())
-        # Find current theme index
-        current_index = theme_names.index(self.current_theme)
-        # Get next theme
-        next_index = (current_index + 1) % len(theme_names)
-        self.current_theme = theme_names[next_index]
-        
+    def toggle_theme(self) -> bool:
+        """Toggle between available themes; returns False if nothing changed"""
+        self._ensure_custom_loaded()
+        order = self._theme_order
+        if len(order) < 2:
+            return False
+        # Advance to the next theme that loads; files that fail to parse
+        # are skipped
+        for _ in range(len(order)):
+            self._theme_idx = (self._theme_idx + 1) % len(order)
+            if self._load_theme(order[self._theme_idx]):
+                break
+        if order[self._theme_idx] == self.current_theme:
+            return False
+        self.current_theme = order[self._theme_idx]
+
         # Update theme colors
         self.theme_colors = self._get_theme_colors()
+        self._color_cache.clear()
         # Update config
         self.config["theme"] = self.current_theme
+        return True
 
-    def get_theme_colors(self) -> Dict[str, str]:
+    def get_theme_colors(self) -> Mapping[str, str]:
         """Get current theme colors"""
         return self.theme_colors
 
+    def color(self, key: str, default: str) -> str:
+        """Get one color of the current theme (cached until the theme changes)"""
+        try:
+            return self._color_cache[key, default]
+        except KeyError:
+            value = self._color_cache[key, default] = self.theme_colors.get(key, default)
+            return value
+
     def get_current_theme(self) -> str:
         """Get current theme name"""
         return self.current_theme
@@ -127,86 +311,66 @@ class ThemeManager:
             return False
             
         # Save theme to config directory
-        config_dir = os.path.expanduser("~/.config/amdtop/themes")
-        os.makedirs(config_dir, exist_ok=True)
-        
-        theme_path = os.path.join(config_dir, f"{name}.json")
+        theme_path = os.path.join(_THEMES_DIR, f"{name}.json")
+        tmp_path = theme_path + ".tmp"
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC
         try:
-            with open(theme_path, 'w') as f:
-                json.dump(colors, f, indent=2)
-            self.themes[name] = colors
+            # Serialize once, write in a single call, then swap into place
+            payload = _json_dumps(dict(colors))
+            try:
+                fd = os.open(tmp_path, flags, 0o644)
+            except FileNotFoundError:
+                # First theme saved; create the directory
+                os.makedirs(_THEMES_DIR, exist_ok=True)
+                fd = os.open(tmp_path, flags, 0o644)
+            try:
+                os.write(fd, payload)
+            finally:
+                os.close(fd)
+            os.replace(tmp_path, theme_path)
+            self._register_theme(name, dict(colors))
+            if name == self.current_theme:
+                self.theme_colors = self._get_theme_colors()
+                self._color_cache.clear()
             return True
         except OSError:
             return False
 
     def generate_css(self) -> str:
-        """Generate CSS from current theme colors"""
-        colors = self.get_theme_colors()
-        css = f"""
-        .app-grid {{
-            background: {colors['background']};
-            color: {colors['text']};
-        }}
-        
-        Header {{
-            background: {colors['header_background']};
-        }}
-        
-        .widget {{
-            background: {colors['widget_background']};
-            border: 1px solid {colors['widget_border']};
-        }}
-        
-        Tab {{
-            color: {colors['text_muted']};
-        }}
-        
-        Tab:hover {{
-            background: {colors['tab_hover']};
-        }}
-        
-        Tab.-active {{
-            background: {colors['tab_active']};
-            color: {colors['text']};
-        }}
-        
-        #cpu_graph {{
-            color: {colors['cpu_graph']};
-        }}
-        
-        #memory_graph {{
-            color: {colors['memory_graph']};
-        }}
-        
-        #gpu_graph {{
-            color: {colors['gpu_graph']};
-        }}
-        """
+        """Get CSS for current theme colors (cached per theme)"""
+        css = self._css_cache.get(self.current_theme)
+        if css is None:
+            css = self._css_cache[self.current_theme] = _render_css(self.theme_colors)
         return css
 
-# Test the module if run directly
-if __name__ == "__main__":
+# Test the module if run directly (set AMDTOP_SELFTEST=1)
+if __name__ == "__main__" and os.environ.get("AMDTOP_SELFTEST"):
+    import tempfile
+
+    # Keep the self-test away from the user's real theme directory
+    _THEMES_DIR = tempfile.mkdtemp(prefix="amdtop-themes-")
+
     config = {"theme": "dark"}
     theme_manager = ThemeManager(config)
-    
+
     # Print current theme colors
     print("Current theme:", theme_manager.get_current_theme())
     print("\nTheme colors:")
     for key, value in theme_manager.get_theme_colors().items():
         print(f"{key}: {value}")
-    
+
     # Test theme toggle
     print("\nToggling theme...")
     theme_manager.toggle_theme()
     print("New theme:", theme_manager.get_current_theme())
-    
+
     # Test custom theme
     print("\nAdding custom theme...")
     custom_theme = DARK_THEME.copy()
     custom_theme["background"] = "#000000"
     success = theme_manager.add_custom_theme("custom", custom_theme)
     print("Custom theme added:", success)
-    
+
     # Print generated CSS
     print("\nGenerated CSS:")
     print(theme_manager.generate_css())